@@ -1,5 +1,9 @@
-from copy import deepcopy
-from random import choice, uniform
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import partial
+from io import StringIO
+from random import choice, seed, uniform
 from enum import Enum
 
 
@@ -8,6 +12,9 @@ class Place(object):
     A Place holds bees and is linked to other Places.
     """
 
+    __slots__ = ('world_x', 'world_y', 'sources', 'destinations', 'bees', '_game', '_rings')
+    is_colony = False  # True for the kinds of Place that can hold an Ant; cheaper to test than isinstance
+
     def __init__(self, world_x, world_y):
         """
         Create a Place at the given x and y coordinates.
@@ -16,7 +23,9 @@ class Place(object):
         self.world_y = world_y
         self.sources = []
         self.destinations = []
-        self.bees = []
+        self.bees = {}  # used as an insertion-ordered set
+        self._game = None  # set by GameState.__init__
+        self._rings = None  # set by _precompute_rings
 
     def connect_to(self, place):
         """
@@ -25,6 +34,26 @@ class Place(object):
         self.destinations.append(place)
         place.sources.append(self)
 
+    def _precompute_rings(self, maximum_range):
+        """
+        Record, for every distance d up to maximum_range, the ColonyPlaces that are exactly d steps upstream of this
+        Place (following sources), in breadth-first order.  Only call this once the world's connections are final, since
+        the rings are not updated by later calls to connect_to.
+        """
+        rings = [[self] if self.is_colony else []]
+        visited = {self}
+        frontier = [self]
+        for _ in range(maximum_range):
+            next_frontier = []
+            for place in frontier:
+                for source in place.sources:
+                    if source not in visited:
+                        visited.add(source)
+                        next_frontier.append(source)
+            frontier = next_frontier
+            rings.append([place for place in frontier if place.is_colony])
+        self._rings = rings
+
     @property
     def defender(self):
         """
@@ -40,16 +69,24 @@ class Place(object):
         """
         assert isinstance(insect, Bee), f'The place {self} cannot hold {insect} of the type {type(insect).__name__}'
         assert insect not in self.bees, f'The bee {insect} cannot be added to {self} twice'
-        self.bees.append(insect)
+        self.bees[insect] = None
         insect.place = self
+        if self._game is not None:
+            self._game._bees[insect] = None
+            if self.is_colony:
+                self._game._colony_bee_count += 1
 
     def remove_insect(self, insect):
         """
         Remove an Insect from this Place.
         """
         assert insect in self.bees, f'{insect} is not at {self} to be removed'
-        self.bees.remove(insect)
+        del self.bees[insect]
         insect.place = None
+        if self._game is not None:
+            del self._game._bees[insect]
+            if self.is_colony:
+                self._game._colony_bee_count -= 1
 
     def __repr__(self):
         return f'{type(self).__name__}({self.world_x}, {self.world_y})'
@@ -60,6 +97,9 @@ class ColonyPlace(Place):
     A ColonyPlace, unlike a regular Place, can hold an Ant and be the target of an Ant's attack.
     """
 
+    __slots__ = ('ant',)
+    is_colony = True
+
     def __init__(self, world_x, world_y):
         """
         Create a ColonyPlace at the given coordinates.
@@ -83,10 +123,14 @@ class ColonyPlace(Place):
 
         There can be any number of Bees in a Place.
         """
-        if isinstance(insect, Ant):
+        if insect.is_ant:
             assert self.ant is None, f'The place {self} cannot hold both {self.ant} and {insect}'
             self.ant = insect
             insect.place = self
+            if self._game is not None:
+                self._game._ants[insect] = None
+                if insect.has_action:
+                    self._game._acting_ants[insect] = None
         else:
             super().add_insect(insect)
 
@@ -94,10 +138,13 @@ class ColonyPlace(Place):
         """
         Remove an Insect from this Place.
         """
-        if isinstance(insect, Ant):
+        if insect.is_ant:
             assert insect is self.ant, f'The ant {insect} is not at {self} to be removed'
             self.ant = None
             insect.place = None
+            if self._game is not None:
+                del self._game._ants[insect]
+                self._game._acting_ants.pop(insect, None)
         else:
             super().remove_insect(insect)
 
@@ -123,6 +170,14 @@ class Insect(object):
     An Insect, the base class of Ant and Bee, has health and damage and also a Place.
     """
 
+    __slots__ = ('unit_type', 'health', 'damage', 'place')
+    is_ant = False  # True for Ants; cheaper to test than isinstance
+    has_action = False  # True for the kinds of Insect whose act is not the no-op below; set by __init_subclass__
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.has_action = cls.act is not Insect.act
+
     def __init__(self, unit_type, health=1, damage=0):
         """
         Create an Insect with the given type, health, and damage..
@@ -155,6 +210,8 @@ class Bee(Insect):
     A Bee moves from place to place, following destinations and stinging ants.
     """
 
+    __slots__ = ('delay',)
+
     def __init__(self, health, damage, delay):
         """
         Create a Bee with the given health and damage and make it wait for delay turns before acting.
@@ -167,10 +224,16 @@ class Bee(Insect):
         Move from the Bee's current Place to the destination of that Place.  If there are multiple destinations, choose
         one at random.
         """
-        if len(self.place.destinations) > 0:
-            destination = choice(self.place.destinations)
-            self.place.remove_insect(self)
-            destination.add_insect(self)
+        place = self.place
+        destinations = place.destinations
+        if len(destinations) == 1:
+            destination = destinations[0]
+        elif len(destinations) > 1:
+            destination = choice(destinations)
+        else:
+            return
+        place.remove_insect(self)
+        destination.add_insect(self)
 
     def act(self, game_state):
         """
@@ -221,8 +284,9 @@ class Bee(Insect):
         >>> bee.delay
         3
         """
-        if self.delay > 0:
-            self.delay -= 1
+        delay = self.delay
+        if delay > 0:
+            self.delay = delay - 1
         else:
             defender = self.place.defender
             if defender is not None and defender.blocks():
@@ -236,6 +300,9 @@ class Ant(Insect):
     An Ant defends a place and does work for the colony.
     """
 
+    __slots__ = ('food_cost',)
+    is_ant = True
+
     def __init__(self, unit_type, food_cost, health=1, damage=0):
         """
         Create an Ant with the given type, cost, health, and damage.
@@ -243,6 +310,19 @@ class Ant(Insect):
         super().__init__(unit_type, health, damage)
         self.food_cost = food_cost
 
+    def clone(self):
+        """
+        Create a copy of this Ant that is not at any Place, as place_ant does with archetypes.  Subclasses that add
+        state extend this method to copy it.
+        """
+        clone = object.__new__(type(self))
+        clone.unit_type = self.unit_type
+        clone.health = self.health
+        clone.damage = self.damage
+        clone.place = None
+        clone.food_cost = self.food_cost
+        return clone
+
     # noinspection PyMethodMayBeStatic
     def blocks(self):  # pylint: disable=no-self-use
         """
@@ -270,6 +350,8 @@ class Harvester(Ant):
     A Harvester produces a certain amount of food per turn for the colony.
     """
 
+    __slots__ = ('production',)
+
     def __init__(self, unit_type, food_cost, health, production):
         """
         Create a Harvester with the given type, cost, health and per-turn food production.
@@ -277,6 +359,14 @@ class Harvester(Ant):
         super().__init__(unit_type, food_cost, health)
         self.production = production
 
+    def clone(self):
+        """
+        Create a copy of this Harvester that is not at any Place.
+        """
+        clone = super().clone()
+        clone.production = self.production
+        return clone
+
     def act(self, game_state):
         """
         A Harvest produces food for the colony.
@@ -289,6 +379,8 @@ class Thrower(Ant):
     A Thrower throws a leaf each turn at the nearest Bee in its range.
     """
 
+    __slots__ = ('ammo', 'minimum_range', 'maximum_range')
+
     def __init__(self, unit_type, food_cost, health, damage, ammo, minimum_range=0, maximum_range=0):
         """
         Create a Thrower with the given type, cost, health, and damage.
@@ -303,24 +395,114 @@ class Thrower(Ant):
         self.minimum_range = minimum_range
         self.maximum_range = maximum_range
 
-    def _in_range_bee_finder(self, root_place, root_distance, visited_places, found_bees):
-        """
-        :param root_place:     The root of the search tree
-        :param root_distance:  The distance of root_place from self.place
-        :param visited_places: Set of places already checked for in-range bees (regardless of whether it holds a bee)
-        :param found_bees:     Set of in-range bees already found
-        :return:               An updated set of visited places, and an updated set of found bees
-        """
-        if root_place not in visited_places and root_place is not None:
-            visited_places.add(root_place)
-            if self.minimum_range <= root_distance <= self.maximum_range:
-                found_bees = found_bees.union(root_place.bees)
-            sources = root_place.sources
-            for source in sources:
-                more_visited_places, more_found_bees = self._in_range_bee_finder(source, root_distance+1, visited_places, found_bees)
-                visited_places = visited_places.union(more_visited_places)
-                found_bees = found_bees.union(more_found_bees)
-        return visited_places, found_bees
+    def clone(self):
+        """
+        Create a copy of this Thrower that is not at any Place.
+        """
+        clone = super().clone()
+        clone.ammo = self.ammo
+        clone.minimum_range = self.minimum_range
+        clone.maximum_range = self.maximum_range
+        return clone
+
+    def _search_range(self):
+        """
+        Search the ColonyPlaces between minimum_range and maximum_range steps upstream of the Ant's place, each counted
+        at its shortest distance.  Return the nearest of them that holds bees (or None) together with a frozenset of the
+        bees at all of them.  The place's precomputed rings are scanned if they reach maximum_range; otherwise the
+        sources are searched breadth-first.
+
+        Both searches find the same target and bees on a standard board, whose rings reach as far as its archetypes'
+        longest range; the last Thrower here outranges the rings and so always searches:
+        >>> ranges = [(0, 2), (1, 3), (2, 4), (3, 3), (2, 6)]
+        >>> throwers = [Thrower(unit_type=UnitType.THROWER, food_cost=0, health=1, damage=1, ammo=4,
+        ...                     minimum_range=minimum_range, maximum_range=maximum_range)
+        ...             for minimum_range, maximum_range in ranges]
+        >>> state = make_standard_game(ant_archetypes=throwers[:-1])
+        >>> colony = [place for place in state.places if place.is_colony]
+        >>> {len(place._rings) for place in colony}
+        {5}
+        >>> throwers = [thrower.clone() for thrower in throwers]
+        >>> for thrower, place in zip(throwers, colony[20::11]):
+        ...     place.add_insect(thrower)
+        >>> for bee, place in zip(state.bees, colony[1::6]):
+        ...     bee.place.remove_insect(bee)
+        ...     place.add_insect(bee)
+        >>> ring_results = [thrower._search_range() for thrower in throwers]
+        >>> for thrower in throwers:
+        ...     thrower.place._rings = None
+        >>> [thrower._search_range() for thrower in throwers] == ring_results
+        True
+        >>> [target is not None for target, _ in ring_results]
+        [True, True, True, True, True]
+        """
+        target = None
+        found_bees = []
+        origin = self.place
+        minimum_range = self.minimum_range
+        maximum_range = self.maximum_range
+        if origin is None or maximum_range < 0:
+            return target, frozenset()
+        rings = origin._rings
+        if rings is not None and maximum_range < len(rings):
+            for ring in rings[max(minimum_range, 0):maximum_range + 1]:
+                for place in ring:
+                    if len(place.bees) > 0:
+                        if target is None:
+                            target = place
+                        found_bees.extend(place.bees)
+            return target, frozenset(found_bees)
+        visited = {origin}
+        worklist = deque([(origin, 0)])
+        while worklist:
+            place, distance = worklist.popleft()
+            if minimum_range <= distance and place.is_colony and len(place.bees) > 0:
+                if target is None:
+                    target = place
+                found_bees.extend(place.bees)
+            if distance < maximum_range:
+                for source in place.sources:
+                    if source not in visited:
+                        visited.add(source)
+                        worklist.append((source, distance + 1))
+        return target, frozenset(found_bees)
+
+    def _range_contents(self):
+        """
+        Return the result of _search_range, skipping the search altogether while no bee in the Ant's game is at a
+        ColonyPlace.
+
+        The result reflects bees entering, leaving, or dying, even partway through a turn:
+        >>> far_place, near_place, thrower_place = ColonyPlace(2, 0), ColonyPlace(1, 0), ColonyPlace(0, 0)
+        >>> far_place.connect_to(near_place)
+        >>> near_place.connect_to(thrower_place)
+        >>> state = GameState(places=[far_place, near_place, thrower_place], queen_place=None, ant_archetypes=[], food=0)
+        >>> thrower = Thrower(unit_type=UnitType.THROWER, food_cost=0, health=1, damage=1, ammo=2, minimum_range=1, maximum_range=2)
+        >>> thrower_place.add_insect(thrower)
+        >>> bee = Bee(health=2, damage=1, delay=0)
+        >>> far_place.add_insect(bee)
+        >>> thrower.target_place
+        ColonyPlace(2, 0)
+        >>> bee.fly()
+        >>> thrower.target_place
+        ColonyPlace(1, 0)
+        >>> other_bee = Bee(health=2, damage=1, delay=0)
+        >>> far_place.add_insect(other_bee)
+        >>> thrower.in_range_bees == {bee, other_bee}
+        True
+        >>> bee.reduce_health(2)
+        >>> thrower.target_place, thrower.in_range_bees == {other_bee}
+        (ColonyPlace(2, 0), True)
+        >>> other_bee.reduce_health(2)
+        >>> thrower.target_place, thrower.in_range_bees
+        (None, set())
+        """
+        game = self.place._game if self.place is not None else None
+        if game is None:
+            return self._search_range()
+        if game._colony_bee_count == 0:
+            return None, frozenset()  # no bee is in the colony, so none can be targeted
+        return self._search_range()
 
     @property
     def in_range_bees(self):
@@ -377,8 +559,7 @@ class Thrower(Ant):
         >>> ant.in_range_bees
         set()
         """
-        _, bees = self._in_range_bee_finder(self.place, 0, set(), set())
-        return bees
+        return set(self._range_contents()[1])
 
     @property
     def target_place(self):
@@ -386,20 +567,24 @@ class Thrower(Ant):
         Identify the nearest Place with a targetable bee.  Only bees in the colony and between minimum_range and
         maximum_range steps, inclusive, of the candidate place are considered targetable.  (Note that all steps are
         counted equally, regardless of the world_x and world_y of the Places they connect.)  Break ties by ….
+
+        Each Place is counted only at its shortest distance, so a longer walk around a cycle does not bring a Place
+        that is too close, such as the Ant's own, back into range:
+        >>> thrower_place, other_place = ColonyPlace(0, 0), ColonyPlace(1, 0)
+        >>> thrower_place.connect_to(other_place)
+        >>> other_place.connect_to(thrower_place)
+        >>> state = GameState(places=[thrower_place, other_place], queen_place=None, ant_archetypes=[], food=0)
+        >>> thrower = Thrower(unit_type=UnitType.THROWER, food_cost=0, health=1, damage=1, ammo=2, minimum_range=2, maximum_range=2)
+        >>> thrower_place.add_insect(thrower)
+        >>> thrower_place.add_insect(Bee(health=1, damage=1, delay=0))
+        >>> thrower.target_place
         """
-        if self.maximum_range < 0:
+        place = self.place
+        if place is None:
             return None
-        visited = set()
-        worklist = [(self.place, 0)]
-        while len(worklist) > 0:
-            candidate, distance = worklist.pop(0)
-            if self.minimum_range <= distance and isinstance(candidate, ColonyPlace) and len(candidate.bees) > 0:
-                return candidate
-            if candidate not in visited:
-                visited.add(candidate)
-                if distance + 1 <= self.maximum_range:
-                    worklist.extend((source, distance + 1) for source in candidate.sources)
-        return None
+        if self.minimum_range <= 0 <= self.maximum_range and place.is_colony and len(place.bees) > 0:
+            return place  # bees at the Ant's own place are always the nearest ones
+        return self._range_contents()[0]
 
     @property
     def _target_bee(self):
@@ -407,7 +592,12 @@ class Thrower(Ant):
         Choose a random Bee in the place that the Ant's throws are targeting, if any.
         """
         target = self.target_place
-        return choice(target.bees) if target is not None else None
+        if target is None:
+            return None
+        bees = target.bees
+        if len(bees) == 1:
+            return next(iter(bees))
+        return choice(list(bees))
 
     def _hit_bee(self, target_bee):
         """
@@ -446,7 +636,7 @@ class Thrower(Ant):
         >>> thrower.act(state)
         >>> thrower.target_place
         >>> in_range = thrower.in_range_bees
-        >>> Thrower._in_range_bee_finder == bee
+        >>> bee in in_range
         False
         >>> bee.health
         1
@@ -456,7 +646,7 @@ class Thrower(Ant):
 
         or that has already flown past this Ant:
         >>> place = [ColonyPlace(0, 1), ColonyPlace(1,1), ColonyPlace(2,1)]
-        >>> state = GameState(places=[place], queen_place=None, ant_archetypes=[], food=0)
+        >>> state = GameState(places=place, queen_place=None, ant_archetypes=[], food=0)
         >>> thrower = Thrower(unit_type=UnitType.THROWER, food_cost=0, health=2, damage=1, ammo=2, minimum_range=1, maximum_range=2)
         >>> bee = Bee(health=1, damage=1, delay=0)
         >>> place[0].add_insect(bee)
@@ -514,26 +704,28 @@ class Thrower(Ant):
         target_bee = self._target_bee
         if target_bee is not None:
             self._hit_bee(target_bee)
-            self.ammo -= 1
-            if self.ammo <= 0:
+            ammo = self.ammo - 1
+            self.ammo = ammo
+            if ammo <= 0:
                 self.reduce_health(self.health)
 
 
 class SuperThrower(Thrower):
+    __slots__ = ()
+
     def act(self, game_state):
         if self.health == 1:
             self.ammo += 1
         super().act(game_state)
-        print(self.ammo)
+        if game_state.diagnostics:
+            print(self.ammo)
 
 
 class MegaThrower(Thrower):
+    __slots__ = ()
+
     def act(self, game_state):
-        surrounding_ants_count = 0
-        for place in self.place.sources:
-            if isinstance(place.defender, Ant):
-                surrounding_ants_count += 1
-        self.damage = surrounding_ants_count
+        self.damage = sum(place.defender is not None for place in self.place.sources)  # only Ants defend places
         super().act(game_state)
 
 
@@ -541,6 +733,9 @@ class SuperHarvester(Harvester):
     """
     A SuperHarvester produces a certain amount of food for the colony but will die if it does not have an adjacent Thrower
     """
+
+    __slots__ = ()
+
     def act(self, game_state):
         """
         If there is not an adjacent Thrower to the SuperHarvester, it will die:
@@ -569,14 +764,10 @@ class SuperHarvester(Harvester):
         >>> state.food
         2
         """
-        going_to_die = True
-        for place in self.place.sources:
-            if isinstance(place.defender, Thrower):
-                going_to_die = False
-        if going_to_die:
-            self.reduce_health(self.health)
-        else:
+        if any(isinstance(place.defender, Thrower) for place in self.place.sources):
             super().act(game_state)
+        else:
+            self.reduce_health(self.health)
 
 
 class GameOutcome(Enum):
@@ -610,31 +801,56 @@ class GameState(object):
         self.food = food
         self.turn_number = 0
         self.diagnostics = False
+        # The insects currently in the world, kept up to date by the Places' add_insect and remove_insect; dicts are
+        # used as insertion-ordered sets so that the order in which insects act is reproducible.  _acting_ants leaves
+        # out the Ants without has_action, whose act is the inherited no-op, so that take_turn does not call them.
+        self._ants = {}
+        self._acting_ants = {}
+        self._bees = {}
+        self._colony_bee_count = 0  # how many of the bees are at ColonyPlaces, and so can be targeted
+        for place in places:
+            place._game = self
+            if place.defender is not None:
+                self._ants[place.defender] = None
+                if place.defender.has_action:
+                    self._acting_ants[place.defender] = None
+            for bee in place.bees:
+                self._bees[bee] = None
+            if place.is_colony:
+                self._colony_bee_count += len(place.bees)
 
     @property
     def ants(self):
         """
         Collect a list of all of the Ants deployed in the world.
         """
-        return [place.defender for place in self.places if place.defender is not None]
+        return list(self._ants)
 
     @property
     def bees(self):
         """
         Collect a list of all of the Bees deployed in the world.
         """
-        return [bee for place in self.places for bee in place.bees]
+        return list(self._bees)
 
     def place_ant(self, ant_archetype, place):
         """
         Make a player move to place an Ant based on the given archetype at the given Place.  Return that Ant, or None if
         the Ant could not be placed.  Ants can only be placed on empty Places.
+
+        The placed Ant is a clone of the archetype, which itself stays out of play:
+        >>> place = ColonyPlace(0, 0)
+        >>> state = GameState(places=[place], queen_place=None, ant_archetypes=[], food=5)
+        >>> archetype = Harvester(UnitType.HARVESTER, food_cost=3, health=1, production=1)
+        >>> ant = state.place_ant(archetype, place)
+        >>> ant is archetype, type(ant).__name__, ant.place, archetype.place, state.food
+        (False, 'Harvester', ColonyPlace(0, 0), None, 2)
         """
         if ant_archetype is None or place.defender is not None or len(place.bees) > 0 or\
                 self.food < ant_archetype.food_cost:
             return None
         self.food -= ant_archetype.food_cost
-        ant = deepcopy(ant_archetype)
+        ant = ant_archetype.clone()
         place.add_insect(ant)
         return ant
 
@@ -644,8 +860,7 @@ class GameState(object):
         """
         if ant is not None:
             assert ant.place is not None, f'Cannot sacrifice {ant}, which is already dead'
-            assert any(place.defender is ant for place in self.places),\
-                f'Cannot sacrifice {ant}, which belongs to a different game'
+            assert ant.place._game is self, f'Cannot sacrifice {ant}, which belongs to a different game'
             ant.reduce_health(ant.health)
 
     def show_game_status(self):
@@ -653,11 +868,11 @@ class GameState(object):
         Displays the turn number, the number of ants and bees, and the number of bees in range of at least one ant.
         """
         vulnerable_bees = set()
-        for ant in self.ants:
-            vulnerable_bees = vulnerable_bees.union(ant.in_range_bees)
+        for ant in self._ants:
+            vulnerable_bees.update(ant.in_range_bees)
         if self.turn_number == 1:
             print(f'  Turn    Number of ants    Number of bees    Number of targetable bees')
-        print(f'{self.turn_number:>6}    {len(self.ants):>14}    {len(self.bees):>14}    {len(vulnerable_bees):>25}')
+        print(f'{self.turn_number:>6}    {len(self._ants):>14}    {len(self._bees):>14}    {len(vulnerable_bees):>25}')
 
     def take_turn(self):
         """
@@ -670,15 +885,18 @@ class GameState(object):
         if len(self.queen_place.bees) > 0:
             print(f'Game lost after {self.turn_number} turns. Try again.')
             return GameOutcome.LOSS
-        if len(self.bees) == 0:
+        if not self._bees:
             print(f'Game won after {self.turn_number} turns. Congratulations!')
             return GameOutcome.WIN
         if self.diagnostics:
             self.show_game_status()
-        for ant in self.ants:
+        ants = tuple(self._acting_ants)
+        bees = tuple(self._bees)
+        for ant in ants:
             ant.act(self)
-        for bee in self.bees:
-            bee.act(self)
+        for bee in bees:
+            if bee.place is not None:  # skip bees killed during the ants' phase
+                bee.act(self)
         return GameOutcome.UNRESOLVED
 
 
@@ -695,8 +913,10 @@ def make_standard_game(radius=4, wave_count=4, wave_size=2, wave_growth=1, wave_
                        ant_archetypes=STANDARD_ANT_ARCHETYPES, food=15):
     """
     Construct the GameState for the beginning of a standard game, which has the ant queen in the center of a square of
-    ColonyPlaces, the Bee's hive on the periphery, and Bee's attacking in waves of increasing size.  Most of the
-    specifics of this setup can be varied by specifying non-default arguments.
+    ColonyPlaces, the Bees' hive on the periphery, and Bees attacking in waves of increasing size.  Each Bee waits in a
+    hive Place just beyond the boundary place that it will enter by, and Bees that share an entrance share a hive Place.
+    Most of the specifics of this setup can be varied by specifying non-default arguments.  The returned Places'
+    connections are frozen, so connect_to cannot be called on them.
     """
     assert radius > 0, 'Cannot create a game with a nonpositive radius'
 
@@ -706,38 +926,95 @@ def make_standard_game(radius=4, wave_count=4, wave_size=2, wave_growth=1, wave_
     # noinspection PyTypeChecker
     grid[radius][radius] = queen_place
 
-    def distance_from(x, y):
-        return max(abs(x - radius), abs(y - radius))
+    distances = [[max(abs(x - radius), abs(y - radius)) for y in range(side_length)] for x in range(side_length)]
+
+    neighbor_offsets = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)]
 
     boundary = []
     for x in range(side_length):
         for y in range(side_length):
-            distance = distance_from(x, y)
+            place = grid[x][y]
+            distance = distances[x][y]
             if distance == radius:
-                boundary.append(grid[x][y])
-            for adjacent_x in range(max(x - 1, 0), min(x + 2, side_length)):
-                for adjacent_y in range(max(y - 1, 0), min(y + 2, side_length)):
-                    if (adjacent_x, adjacent_y) != (x, y) and distance_from(adjacent_x, adjacent_y) <= distance:
-                        grid[x][y].connect_to(grid[adjacent_x][adjacent_y])
+                boundary.append(place)
+            for dx, dy in neighbor_offsets:
+                adjacent_x = x + dx
+                adjacent_y = y + dy
+                if 0 <= adjacent_x < side_length and 0 <= adjacent_y < side_length and\
+                        distances[adjacent_x][adjacent_y] <= distance:
+                    place.connect_to(grid[adjacent_x][adjacent_y])
 
     minimum_stretch = (radius + 1) / radius
     maximum_stretch = (radius + 3) / radius
     all_places = [place for column in grid for place in column]
+    hive_places = {}  # the hive Place beyond each entrance that some Bee has chosen
     for wave_index in range(wave_count):
         for _ in range(wave_size + wave_index * wave_growth):
-            bee = Bee(bee_health, bee_damage, wave_index * wave_interval)
             entrance = choice(boundary)
-            hive_place = Place(uniform(minimum_stretch, maximum_stretch) * (entrance.world_x - radius) + radius,
-                               uniform(minimum_stretch, maximum_stretch) * (entrance.world_y - radius) + radius)
-            hive_place.add_insect(bee)
-            hive_place.connect_to(entrance)
-            # noinspection PyTypeChecker
-            all_places.append(hive_place)
+            hive_place = hive_places.get(entrance)
+            if hive_place is None:
+                hive_place = Place(uniform(minimum_stretch, maximum_stretch) * (entrance.world_x - radius) + radius,
+                                   uniform(minimum_stretch, maximum_stretch) * (entrance.world_y - radius) + radius)
+                hive_place.connect_to(entrance)
+                hive_places[entrance] = hive_place
+                # noinspection PyTypeChecker
+                all_places.append(hive_place)
+            hive_place.add_insect(Bee(bee_health, bee_damage, wave_index * wave_interval))
 
     x_shift = 1 - min(place.world_x for place in all_places)
     y_shift = 1 - min(place.world_y for place in all_places)
+    # rings beyond the longest range of any archetype would never be read; Throwers built otherwise search instead
+    ring_range = max((getattr(archetype, 'maximum_range', 0) for archetype in ant_archetypes), default=0)
     for place in all_places:
         place.world_x += x_shift
         place.world_y += y_shift
+        # the world's connections are final, so freeze them into tuples, which are smaller and faster to iterate
+        place.sources = tuple(place.sources)
+        place.destinations = tuple(place.destinations)
+        if place.is_colony:
+            place._precompute_rings(ring_range)
 
     return GameState(all_places, queen_place, ant_archetypes, food)
+
+
+def simulate_game(game_factory, random_seed, max_turns=None):
+    """
+    Seed the random number generator, build a GameState by calling game_factory, and let turns pass until the game is
+    over or max_turns turns have been taken.  Return the GameOutcome, which is GameOutcome.UNRESOLVED if the turn limit
+    was reached first.  The factory may deploy ants, but no other player moves are made.  Games draw from the random
+    module's global generator, so calling this also reseeds that generator for the caller.
+    >>> simulate_game(make_standard_game, 0)
+    Game lost after 8 turns. Try again.
+    <GameOutcome.LOSS: 'LOSS'>
+    >>> simulate_game(make_standard_game, 0, max_turns=3)
+    <GameOutcome.UNRESOLVED: 'UNRESOLVED'>
+    """
+    seed(random_seed)
+    game_state = game_factory()
+    outcome = GameOutcome.UNRESOLVED
+    while outcome is GameOutcome.UNRESOLVED and (max_turns is None or game_state.turn_number < max_turns):
+        outcome = game_state.take_turn()
+    return outcome
+
+
+def run_games(game_factory, random_seeds, max_turns=None, max_workers=None):
+    """
+    Play one game per seed as simulate_game does, spreading the games across up to max_workers processes (by default,
+    one per CPU), and return their GameOutcomes in the order of the seeds.  Each game runs entirely in one process, so
+    game_factory must be picklable, e.g., a module-level function or a functools.partial of one.  The games' printed
+    messages are discarded, since output from games running side by side would interleave.
+    >>> run_games(make_standard_game, [0, 0, 1], max_workers=1)
+    [<GameOutcome.LOSS: 'LOSS'>, <GameOutcome.LOSS: 'LOSS'>, <GameOutcome.LOSS: 'LOSS'>]
+    >>> run_games(make_standard_game, [0], max_turns=3, max_workers=1)
+    [<GameOutcome.UNRESOLVED: 'UNRESOLVED'>]
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(partial(_simulate_game_quietly, game_factory, max_turns), random_seeds))
+
+
+def _simulate_game_quietly(game_factory, max_turns, random_seed):
+    """
+    Play a game as simulate_game does, but discard anything that it prints.
+    """
+    with redirect_stdout(StringIO()):
+        return simulate_game(game_factory, random_seed, max_turns)
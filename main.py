@@ -1,10 +1,10 @@
-from functools import partial
 from random import uniform
 
 from kivy.app import App
-from kivy.properties import NumericProperty, StringProperty, ListProperty, ObjectProperty
+from kivy.properties import NumericProperty, StringProperty, ListProperty, ObjectProperty, ReferenceListProperty
 from kivy.uix.label import Label
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.relativelayout import RelativeLayout
 from kivy.uix.image import Image
 from kivy.uix.behaviors import ButtonBehavior, ToggleButtonBehavior
 from kivy.clock import Clock
@@ -52,41 +52,53 @@ class OverlayButtonBehavior(ButtonBehavior):
     """
     def on_touch_down(self, touch):
         """
-        Handle the touch-down event, but always return False to allow widgets underneath to process it also.
+        Handle the touch-down event, but always return False to allow widgets underneath to process it also.  Touches
+        that miss the widget are ignored at once, since ButtonBehavior would not press for them anyway.
         """
-        super().on_touch_down(touch)
+        if self.collide_point(*touch.pos):
+            super().on_touch_down(touch)
         return False
 
     def on_touch_move(self, touch):
         """
         Handle the touch-move event, but always return False to allow widgets underneath to process it also.
         """
-        super().on_touch_down(touch)
+        super().on_touch_move(touch)
         return False
 
     def on_touch_up(self, touch):
         """
         Handle the touch-up event, but always return False to allow widgets underneath to process it also.
         """
-        super().on_touch_down(touch)
+        super().on_touch_up(touch)
         return False
 
 
 class Sprite(OverlayButtonBehavior, Image):
     """
     A Sprite is an Image that is meant for use in RelativeLayouts.  Its position is controlled by two properties,
-    world_x and world_y, which are scaled up by the size of one standard sprite to compute the Sprite's position.
+    world_x and world_y, which are scaled up by the size of one standard sprite to compute the Sprite's position.  The
+    kv rule reads them through world_pos, so setting world_pos moves the Sprite with a single update.
     """
     world_x = NumericProperty(0)
     world_y = NumericProperty(0)
+    world_pos = ReferenceListProperty(world_x, world_y)  # assign this to move a Sprite with only one layout update
     scale = NumericProperty(1)
 
     def __init__(self, world_x, world_y, z_index, sprite_filename, **kwargs):
-        super().__init__(**kwargs)
-        self.world_x = world_x
-        self.world_y = world_y
+        super().__init__(world_x=world_x, world_y=world_y, source=sprite_filename, **kwargs)
         self.z_index = z_index
-        self.source = sprite_filename
+
+
+class LeafSprite(Sprite):
+    """
+    A LeafSprite is a Sprite for a thrown leaf.  It also records the leaf's trajectory, in slots rather than in the
+    instance dictionary, because _animate_leaf reads the trajectory every frame.
+    """
+    __slots__ = ('source_x', 'source_y', 'target_x', 'target_y', 'arc')
+
+    def __init__(self, world_x, world_y, z_index, sprite_filename, **kwargs):
+        super().__init__(world_x, world_y, z_index, sprite_filename, **kwargs)
         self.source_x = None  # Used by _refresh_leaves
         self.source_y = None  # Used by _refresh_leaves
         self.target_x = None  # Used by _refresh_leaves
@@ -132,6 +144,8 @@ class Game(BoxLayout):
     MAXIMUM_ARC = 1.5  # grid units
 
     TURN_FRAMES = TURN_LENGTH * FRAME_RATE
+    FRAME_LENGTH = 1 / FRAME_RATE  # seconds per frame
+    FALLING_STEP = FALLING_RATE / FRAME_RATE  # z units per frame
     THROW_COEFFICIENT_2 = -1  # coefficient of t² in the animation parabola
     THROW_COEFFICIENT_1 = THROW_DURATION + 2  # coefficient of t¹ in the animation parabola
     THROW_COEFFICIENT_0 = -THROW_DURATION - 1  # coefficient of t⁰ in the animation parabola
@@ -149,7 +163,11 @@ class Game(BoxLayout):
         super(Game, self).__init__()
         self.frames_until_next_turn = Game.TURN_FRAMES
         self.insect_sprites = {}
+        self.living_insect_sprites = []  # (insect, sprite) pairs for the insects at a Place
+        self.falling_insect_sprites = []  # (insect, sprite) pairs for the dead insects whose sprites are still shrinking
         self.leaf_sprites = []
+        self.leaf_pool = []  # hidden leaf Sprites, kept in the leaf layer for reuse
+        self.z_index_counts = [0] * (Game.LEAF_Z_INDEX + 1)  # how many of the battlefield's children have each z_index
         self.game_state = game_state
         self._build()
 
@@ -159,10 +177,11 @@ class Game(BoxLayout):
         Or, if ant_archetype is None, create a button that allows the player to sacrifice Ants.
         """
         button = ImageToggleButton()
-        button.group = 'ants-{hashcode}'.format(hashcode=hash(self))
+        button.group = f'ants-{hash(self)}'
         button.source = Game.UNIT_SPRITE_FILENAMES[ant_archetype.unit_type] if ant_archetype is not None else\
             Game.REMOVER_SPRITE_FILENAME
-        button.on_press = partial(self.on_press_archetype, button, ant_archetype)
+        button.ant_archetype = ant_archetype
+        button.bind(on_press=self.on_press_archetype)
         if ant_archetype is None:
             self.ids.remover = button
             self.ids.remover.state = 'down'
@@ -173,14 +192,16 @@ class Game(BoxLayout):
         Destroy a Sprite on the battlefield.
         """
         self.ids.field.remove_widget(sprite)
+        self.z_index_counts[sprite.z_index] -= 1
 
     def _create_sprite(self, world_x, world_y, sprite_filename, z_index):
         """
         Create a Sprite at the given coordinates on the battlefield displaying the given image file.
         """
         sprite = Sprite(world_x, world_y, z_index, sprite_filename)
-        field = self.ids.field
-        field.add_widget(sprite, sum(child.z_index > z_index for child in field.children))
+        # the battlefield's children are sorted by descending z_index, so the Sprite goes after all of the higher ones
+        self.ids.field.add_widget(sprite, sum(self.z_index_counts[z_index + 1:]))
+        self.z_index_counts[z_index] += 1
         return sprite
 
     def _create_insect_sprite(self, insect, place, z_index):
@@ -193,14 +214,32 @@ class Game(BoxLayout):
         filename = Game.UNIT_SPRITE_FILENAMES[insect.unit_type]
         sprite = self._create_sprite(place.world_x, place.world_y, filename, z_index)
         self.insect_sprites[insect] = sprite
+        if insect.place is not None:
+            self.living_insect_sprites.append((insect, sprite))
+        else:
+            self.falling_insect_sprites.append((insect, sprite))
+
+    def _retire_dead_insects(self):
+        """
+        Move the sprites of Insects that have died from the living list to the falling list.  Insects only die during
+        a turn or when sacrificed, so this only needs to be called after those.
+        """
+        living_insect_sprites = []
+        for insect, sprite in self.living_insect_sprites:
+            if insect.place is not None:
+                living_insect_sprites.append((insect, sprite))
+            else:
+                self.falling_insect_sprites.append((insect, sprite))
+        self.living_insect_sprites = living_insect_sprites
 
     def _create_place_sprite(self, place):
         """
         Create a Sprite for a Place.  The Sprite is automatically positioned.
         """
-        if isinstance(place, ants_vs_some_bees.ColonyPlace):
+        if place.is_colony:
             sprite = self._create_sprite(place.world_x, place.world_y, Game.PLACE_SPRITE_FILENAME, Game.GROUND_Z_INDEX)
-            sprite.on_press = partial(self.on_press_place, place)
+            sprite.place = place
+            sprite.bind(on_press=self.on_press_place)
             return sprite
         if place is self.game_state.queen_place:
             return self._create_sprite(place.world_x, place.world_y, Game.QUEEN_SPRITE_FILENAME, Game.ANT_Z_INDEX)
@@ -222,14 +261,25 @@ class Game(BoxLayout):
         # noinspection PyTypeChecker
         self._create_ant_button(None)
 
-        max_x = max(place.world_x for place in self.game_state.places) + 1
-        max_y = max(place.world_y for place in self.game_state.places) + 1
+        max_x = max_y = 0
+        for place in self.game_state.places:
+            self._create_place_sprite(place)
+            if place.world_x > max_x:
+                max_x = place.world_x
+            if place.world_y > max_y:
+                max_y = place.world_y
+        max_x += 1
+        max_y += 1
         self.ids.field.size = (Game.SPRITE_WIDTH * (max_x + 1), Game.SPRITE_HEIGHT * (max_y + 1))
         self.ids.field_scroll.scroll_x = 0.5
         self.ids.field_scroll.scroll_y = 0.5
 
-        for place in self.game_state.places:
-            self._create_place_sprite(place)
+        # all of the leaves, including the pooled ones, go in one layer above the other sprites
+        self.leaf_layer = RelativeLayout()
+        self.leaf_layer.z_index = Game.LEAF_Z_INDEX
+        self.ids.field.add_widget(self.leaf_layer)
+        self.z_index_counts[Game.LEAF_Z_INDEX] += 1
+
         for ant in self.game_state.ants:
             self._create_insect_sprite(ant, ant.place, Game.ANT_Z_INDEX)
         for bee in self.game_state.bees:
@@ -237,48 +287,66 @@ class Game(BoxLayout):
 
         self._refresh_food()
 
-        self.animator = Clock.schedule_interval(lambda delta: self.animate(), 1 / Game.FRAME_RATE)
+        self.animator = Clock.schedule_interval(self.animate, Game.FRAME_LENGTH)
 
-    def _animate_insect(self, insect, sprite):
+    def _animate_insect(self, insect, sprite, weight, counterweight):
         """
-        Reposition the given Sprite to match the state of the given Insect according to the Game's current frame count.
+        Reposition the given Sprite to match the state of the given living Insect, moving it the fraction weight of the
+        way to the Insect's place.  The counterweight must be 1 - weight.
         """
         place = insect.place
-        if place is not None:
-            weight = 1 / self.frames_until_next_turn
-            counterweight = 1 - weight
-            sprite.world_x = weight * place.world_x + counterweight * sprite.world_x
-            sprite.world_y = weight * place.world_y + counterweight * sprite.world_y
-        elif sprite.scale > 0:
-            sprite.scale = max(1 / (1 / (sprite.scale + 0.5) + Game.FALLING_RATE / Game.FRAME_RATE) - 0.5, 0)
-
-    def _animate_leaf(self, leaf):
-        """
-        Reposition the given leaf Sprite to match the leaf's trajectory according to the Game's current frame count.
-        """
-        if self.frames_until_next_turn <= Game.THROW_DURATION:
-            weight = (self.frames_until_next_turn - 1) / Game.THROW_DURATION
-            counterweight = 1 - weight
-            arc_delta = \
-                (Game.THROW_COEFFICIENT_2 * self.frames_until_next_turn ** 2 +
-                 Game.THROW_COEFFICIENT_1 * self.frames_until_next_turn +
-                 Game.THROW_COEFFICIENT_0) / Game.THROW_APEX
-            leaf.world_x = weight * leaf.source_x + counterweight * leaf.target_x
-            leaf.world_y = weight * leaf.source_y + counterweight * leaf.target_y + leaf.arc * arc_delta
+        # a turn's last frame has a weight of 1, which puts each sprite exactly on its place, so stationary insects'
+        # sprites need no more updates
+        if sprite.world_x != place.world_x or sprite.world_y != place.world_y:
+            sprite.world_pos = (weight * place.world_x + counterweight * sprite.world_x,
+                                weight * place.world_y + counterweight * sprite.world_y)
+
+    def _animate_falling_insects(self):
+        """
+        Shrink the Sprites of dead Insects as though they were falling away from the battlefield, and destroy each one
+        once it has vanished.
+        """
+        falling_step = Game.FALLING_STEP
+        falling_insect_sprites = []
+        for insect, sprite in self.falling_insect_sprites:
+            sprite.scale = max(1 / (1 / (sprite.scale + 0.5) + falling_step) - 0.5, 0)
+            if sprite.scale > 0:
+                falling_insect_sprites.append((insect, sprite))
+            else:
+                del self.insect_sprites[insect]
+                self._destroy_sprite(sprite)
+        self.falling_insect_sprites = falling_insect_sprites
+
+    def _animate_leaf(self, leaf, weight, counterweight, arc_delta):
+        """
+        Reposition the given leaf Sprite along the leaf's trajectory, leaving it the fraction weight of the way from its
+        target back to its source and raised by arc_delta times its arc.  The counterweight must be 1 - weight.
+        """
+        leaf.world_pos = (weight * leaf.source_x + counterweight * leaf.target_x,
+                          weight * leaf.source_y + counterweight * leaf.target_y + leaf.arc * arc_delta)
 
     def _refresh_leaves(self):
         """
-        Destroy all existing leaf Sprites and replace them with a new set, one leaf for each Ant that attacked a Bee.
-        Also, configure those leaves' trajectories to represent those attacks.
+        Hide all existing leaf Sprites and show a new set, one leaf for each Ant that attacked a Bee.  Also, configure
+        those leaves' trajectories to represent those attacks.  Hidden leaves are pooled and reused rather than
+        destroyed, so that steady play does not create and destroy widgets every turn.
         """
         for leaf in self.leaf_sprites:
-            self._destroy_sprite(leaf)
+            leaf.opacity = 0
+        self.leaf_pool.extend(self.leaf_sprites)
         self.leaf_sprites = []
         for ant in self.game_state.ants:
             target = ant.target_place
             if target is not None:
                 sprite_filename = self.LEAF_SPRITE_FILENAMES[ant.unit_type]
-                sprite = self._create_sprite(ant.place.world_x, ant.place.world_y, sprite_filename, Game.LEAF_Z_INDEX)
+                if self.leaf_pool:
+                    sprite = self.leaf_pool.pop()
+                    sprite.source = sprite_filename
+                    sprite.world_pos = (ant.place.world_x, ant.place.world_y)
+                    sprite.opacity = 1
+                else:
+                    sprite = LeafSprite(ant.place.world_x, ant.place.world_y, Game.LEAF_Z_INDEX, sprite_filename)
+                    self.leaf_layer.add_widget(sprite)
                 sprite.source_x = sprite.world_x
                 sprite.source_y = sprite.world_y
                 sprite.target_x = target.world_x
@@ -286,15 +354,24 @@ class Game(BoxLayout):
                 sprite.arc = uniform(Game.MINIMUM_ARC, Game.MAXIMUM_ARC)
                 self.leaf_sprites.append(sprite)
 
-    def animate(self):
+    def animate(self, _delta_time=None):
         """
         Advance to the next frame of animation.  If enough frames have passed for the game to reach the next turn,
-        advance the game and refresh the widget accordingly.
-        """
-        for insect, sprite in self.insect_sprites.items():
-            self._animate_insect(insect, sprite)
-        for leaf in self.leaf_sprites:
-            self._animate_leaf(leaf)
+        advance the game and refresh the widget accordingly.  The Clock passes the time since the last frame, but
+        animation always advances by exactly one frame.
+        """
+        frames = self.frames_until_next_turn
+        weight = 1 / frames
+        counterweight = 1 - weight
+        for insect, sprite in self.living_insect_sprites:
+            self._animate_insect(insect, sprite, weight, counterweight)
+        if self.falling_insect_sprites:
+            self._animate_falling_insects()
+        if frames <= Game.THROW_DURATION:
+            leaf_weight = Game.THROW_WEIGHTS[frames]
+            arc_delta = Game.THROW_ARC_DELTAS[frames]
+            for leaf in self.leaf_sprites:
+                self._animate_leaf(leaf, leaf_weight, 1 - leaf_weight, arc_delta)
         self.frames_until_next_turn -= 1
         if self.frames_until_next_turn <= 0:
             self.outcome = self.game_state.take_turn()
@@ -302,25 +379,28 @@ class Game(BoxLayout):
                 self.animator.loop = False
             self.time += 1
             self.frames_until_next_turn = Game.TURN_FRAMES
+            self._retire_dead_insects()
             self._refresh_leaves()
             self._refresh_food()
 
-    def on_press_archetype(self, button, ant_archetype):
+    def on_press_archetype(self, button):
         """
         Respond to presses on an ant menu button by ensuring that one ant menu button is always selected and that the
-        selection property holds the corresponding archetype.
+        selection property holds the corresponding archetype, which the button records as its ant_archetype.
         """
+        ant_archetype = button.ant_archetype
         if button.state == 'down' and ant_archetype is not None:
             self.selection = ant_archetype
         else:
             self.selection = None
             self.ids.remover.state = 'down'
 
-    def on_press_place(self, place):
+    def on_press_place(self, sprite):
         """
         Respond to presses on a Place Sprite by placing an Ant (provided the GameState allows the placement) based on
-        the current selection.
+        the current selection.  The Sprite records its Place as its place.
         """
+        place = sprite.place
         if self.selection is not None:
             ant = self.game_state.place_ant(self.selection, place)
             if ant is not None:
@@ -328,6 +408,15 @@ class Game(BoxLayout):
                 self._refresh_food()
         else:
             self.game_state.sacrifice_ant(place.defender)
+            self._retire_dead_insects()
+
+
+# The leaves' interpolation weights and arc heights for every frame of a throw, indexed by frames_until_next_turn.  They
+# are computed here because the comprehensions could not see the other constants from inside the class body.
+Game.THROW_WEIGHTS = tuple((frames - 1) / Game.THROW_DURATION for frames in range(Game.THROW_DURATION + 1))
+Game.THROW_ARC_DELTAS = tuple(
+    (Game.THROW_COEFFICIENT_2 * frames ** 2 + Game.THROW_COEFFICIENT_1 * frames + Game.THROW_COEFFICIENT_0) /
+    Game.THROW_APEX for frames in range(Game.THROW_DURATION + 1))
 
 
 class TowerApp(App):